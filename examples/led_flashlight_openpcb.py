@@ -103,16 +103,21 @@ try:
     rw, rh = resistor.get_bbox_size_mm()
     lw, lh = led.get_bbox_size_mm()
 
+    # Pads indexed by number, built once per footprint (keyed by id since
+    # SWIG proxies don't reliably accept new attributes).
+    _pads_by_number = {}
+
     def pad1_pos_mm(fp):
-        for pad in fp.Pads():
-            try:
-                if str(pad.GetNumber()) == '1' or pad.GetNumber().strip() == '1':
-                    p = pad.GetPosition()
-                    return (pcbnew.ToMM(p.x), pcbnew.ToMM(p.y))
-            except Exception:
-                continue
-        # Fallback: return origin
-        return (0.0, 0.0)
+        pads = _pads_by_number.get(id(fp))
+        if pads is None:
+            pads = {str(p.GetNumber()).strip(): p for p in fp.Pads()}
+            _pads_by_number[id(fp)] = pads
+        pad = pads.get('1')
+        if pad is None:
+            # Fallback: return origin
+            return (0.0, 0.0)
+        p = pad.GetPosition()
+        return (pcbnew.ToMM(p.x), pcbnew.ToMM(p.y))
 
     b_pad = pad1_pos_mm(bat_fp)
     r_pad = pad1_pos_mm(r_fp)
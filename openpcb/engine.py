@@ -13,6 +13,8 @@ Key classes:
 
 Note: When running with real KiCad, pass real `pcbnew.Footprint` objects to `Part`.
 """
+import math
+from array import array
 from typing import Optional, Tuple
 
 try:
@@ -22,31 +24,61 @@ except Exception:
     pcbnew = None
     _HAS_PCBNEW = False
 
-
-def _to_mm(value) -> float:
-    """Convert internal pcbnew units to millimeters.
-
-    If `pcbnew` is not available this is a passthrough (value already mm).
-    """
-    if _HAS_PCBNEW:
+try:
+    from numba import njit as _njit
+    _HAS_NUMBA = True
+except Exception:
+    _njit = None
+    _HAS_NUMBA = False
+
+# Bind the pcbnew helpers once; attribute lookups on the SWIG module aren't
+# free and these are used on every conversion.
+if _HAS_PCBNEW:
+    _ToMM = pcbnew.ToMM
+    _FromMM = pcbnew.FromMM
+    _V2I = pcbnew.VECTOR2I
+else:
+    _V2I = None
+
+# Pad geometry for the placeholder footprints built by `Board.generate`.
+# pcbnew copies these on SetSize/SetFPRelativePosition, so they can be shared.
+if _HAS_PCBNEW:
+    _PAD_SIZE = _V2I(int(_FromMM(0.9)), int(_FromMM(0.9)))
+    _PAD1_OFF = _V2I(int(_FromMM(-0.6)), 0)
+    _PAD2_OFF = _V2I(int(_FromMM(0.6)), 0)
+else:
+    _PAD_SIZE = _PAD1_OFF = _PAD2_OFF = None
+
+
+if _HAS_PCBNEW:
+    def _to_mm(value) -> float:
+        """Convert internal pcbnew units to millimeters."""
         try:
-            return pcbnew.ToMM(value)
-        except Exception:
+            return _ToMM(value)
+        except TypeError:
             return float(value)
-    return float(value)
 
-
-def _from_mm(value_mm: float):
-    """Convert millimeters to pcbnew internal units.
-
-    If `pcbnew` is not available, return the float unchanged.
-    """
-    if _HAS_PCBNEW:
+    def _from_mm(value_mm: float):
+        """Convert millimeters to pcbnew internal units."""
         try:
-            return pcbnew.FromMM(value_mm)
-        except Exception:
+            return _FromMM(value_mm)
+        except TypeError:
             return value_mm
-    return value_mm
+else:
+    # Without pcbnew, values are already in millimeters.
+    _to_mm = float
+
+    def _from_mm(value_mm: float):
+        return value_mm
+
+
+class _VirtualFP:
+    """Stand-in footprint holding only a position, for parts without one."""
+
+    __slots__ = ("pos_mm",)
+
+    def __init__(self, x_mm: float, y_mm: float):
+        self.pos_mm = (x_mm, y_mm)
 
 
 class Part:
@@ -55,23 +87,69 @@ class Part:
     The wrapped object must implement `GetPosition()` and `SetPosition(pt)` when
     running with KiCad. For lightweight testing, you can pass any object that
     exposes `pos_mm` attribute (tuple of two floats) and the wrapper will use it.
+
+    Position and bounding-box lookups are cached on the wrapper so repeated
+    placement calls don't re-query the footprint. If the footprint is moved or
+    reshaped behind the wrapper's back (e.g. `SetOrientation`), call
+    `invalidate_cache()`.
     """
 
     def __init__(self, footprint: Optional[object] = None, name: Optional[str] = None):
+        # Set by `Board.add_part`: {board: row} for every board this part is
+        # on, giving its row in that board's position/size arrays.
+        self._rows = {}
         self.footprint = footprint
         self.name = name or getattr(footprint, "GetReference", lambda: "")()
 
+    @property
+    def footprint(self):
+        """The wrapped footprint object."""
+        return self._footprint
+
+    @footprint.setter
+    def footprint(self, footprint):
+        # Resolve the footprint's capabilities once here so the accessors
+        # below don't have to probe it with hasattr() on every call.
+        self._footprint = footprint
+        self._has_pos_mm = hasattr(footprint, "pos_mm")
+        self._get_pos = getattr(footprint, "GetPosition", None)
+        self._set_pos = getattr(footprint, "SetPosition", None)
+        self._get_bbox = getattr(footprint, "GetBoundingBox", None)
+        self._pads_fn = getattr(footprint, "Pads", None)
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """Drop cached position and bounding-box data for this part."""
+        self._pos_cache = None
+        self._bbox_cache = None
+        for board, idx in self._rows.items():
+            board._invalidate_row(idx)
+
+    def _store_position(self, x_mm: float, y_mm: float):
+        self._pos_cache = (x_mm, y_mm)
+        for board, idx in self._rows.items():
+            i = 2 * idx
+            positions = board._positions
+            positions[i] = x_mm
+            positions[i + 1] = y_mm
+            board._grid = None
+
     def get_position_mm(self) -> Tuple[float, float]:
         """Return (x_mm, y_mm) position of the part's origin in millimeters."""
-        if hasattr(self.footprint, "pos_mm"):
-            return tuple(self.footprint.pos_mm)
+        if self._pos_cache is not None:
+            return self._pos_cache
 
-        if _HAS_PCBNEW and self.footprint is not None:
-            pos = self.footprint.GetPosition()
+        if self._has_pos_mm:
+            self._pos_cache = tuple(self._footprint.pos_mm)
+            return self._pos_cache
+
+        if _HAS_PCBNEW and self._get_pos is not None:
+            pos = self._get_pos()
             try:
-                return (_to_mm(pos.x), _to_mm(pos.y))
+                self._pos_cache = (_to_mm(pos.x), _to_mm(pos.y))
             except Exception:
-                return (float(pos.x), float(pos.y))
+                self._pos_cache = (float(pos.x), float(pos.y))
+            return self._pos_cache
 
         return (0.0, 0.0)
 
@@ -81,11 +159,16 @@ class Part:
         Attempts to use the footprint's bounding box when running with `pcbnew`.
         Falls back to a conservative default size when unavailable.
         """
+        if self._bbox_cache is None:
+            self._bbox_cache = self._compute_bbox_size_mm()
+        return self._bbox_cache
+
+    def _compute_bbox_size_mm(self) -> Tuple[float, float]:
         default_w, default_h = 6.0, 3.0
 
-        if hasattr(self.footprint, "GetBoundingBox") and _HAS_PCBNEW:
+        if _HAS_PCBNEW and self._get_bbox is not None:
             try:
-                bbox = self.footprint.GetBoundingBox()
+                bbox = self._get_bbox()
                 w = _to_mm(bbox.GetWidth())
                 h = _to_mm(bbox.GetHeight())
                 if w <= 0 or h <= 0:
@@ -94,20 +177,32 @@ class Part:
             except Exception:
                 pass
 
-        if hasattr(self.footprint, "Pads"):
+        if self._pads_fn is not None:
             try:
-                xs = []
-                ys = []
-                for pad in self.footprint.Pads():
+                # Track extents in raw footprint units and convert only the
+                # two spans, rather than every pad coordinate.
+                min_x = min_y = max_x = max_y = None
+                for pad in self._pads_fn():
                     try:
                         p = pad.GetPosition()
-                        xs.append(_to_mm(p.x))
-                        ys.append(_to_mm(p.y))
+                        x, y = p.x, p.y
                     except Exception:
                         continue
-                if xs and ys:
-                    w = max(xs) - min(xs)
-                    h = max(ys) - min(ys)
+                    if min_x is None:
+                        min_x = max_x = x
+                        min_y = max_y = y
+                        continue
+                    if x < min_x:
+                        min_x = x
+                    elif x > max_x:
+                        max_x = x
+                    if y < min_y:
+                        min_y = y
+                    elif y > max_y:
+                        max_y = y
+                if min_x is not None:
+                    w = _to_mm(max_x - min_x)
+                    h = _to_mm(max_y - min_y)
                     if w > 0 and h > 0:
                         return (w + 1.0, h + 1.0)
             except Exception:
@@ -117,26 +212,90 @@ class Part:
 
     def set_position_mm(self, x_mm: float, y_mm: float):
         """Set the part origin to (`x_mm`, `y_mm`)."""
-        if _HAS_PCBNEW and self.footprint is not None:
+        # Moving a footprint doesn't change its size, so only the position
+        # cache needs refreshing here.
+        self._store_position(float(x_mm), float(y_mm))
+
+        if _HAS_PCBNEW and self._set_pos is not None:
             try:
-                self.footprint.SetPosition(pcbnew.wxPointMM(x_mm, y_mm))
+                self._set_pos(pcbnew.wxPointMM(x_mm, y_mm))
                 return
             except Exception:
 
                 try:
-                    self.footprint.SetPosition(pcbnew.VECTOR2I(int(_from_mm(x_mm)), int(_from_mm(y_mm))))
+                    self._set_pos(_V2I(int(_from_mm(x_mm)), int(_from_mm(y_mm))))
                     return
                 except Exception:
                     pass
 
 
-        if hasattr(self.footprint, "pos_mm"):
-            self.footprint.pos_mm = (float(x_mm), float(y_mm))
+        if self._has_pos_mm:
+            self._footprint.pos_mm = (float(x_mm), float(y_mm))
             return
 
 
-        self.footprint = type("_virtual", (), {})()
-        self.footprint.pos_mm = (float(x_mm), float(y_mm))
+        self.footprint = _VirtualFP(float(x_mm), float(y_mm))
+        self._store_position(*self._footprint.pos_mm)
+
+
+# Unit step along each placement direction (KiCad's Y axis points down).
+_DIR_VECS = {
+    "right": (1.0, 0.0),
+    "left": (-1.0, 0.0),
+    "top": (0.0, -1.0),
+    "bottom": (0.0, 1.0),
+}
+
+_NAN = float("nan")
+
+# Boxes must overlap by more than this (mm) to count as overlapping, so parts
+# placed edge to edge don't collide through float rounding. This is below
+# pcbnew's 1 nm internal resolution.
+_OVERLAP_EPS = 1e-6
+_INF = float("inf")
+
+
+def _jit(fn):
+    """Compile `fn` with numba when it is installed; otherwise return it as is.
+
+    Kernels passed through here must stick to indexing, `len` and arithmetic
+    on flat buffers so they run unchanged either way.
+    """
+    if _HAS_NUMBA:
+        return _njit(cache=True)(fn)
+    return fn
+
+
+@_jit
+def _hpwl_kernel(positions, net_rows, net_offsets):
+    """Sum per-net HPWL over a flat (x, y) `positions` buffer.
+
+    Nets are in CSR form: net `n`'s part rows are
+    `net_rows[net_offsets[n]:net_offsets[n + 1]]`.
+    """
+    total = 0.0
+    for n in range(len(net_offsets) - 1):
+        start = net_offsets[n]
+        end = net_offsets[n + 1]
+        if end - start < 2:
+            continue
+        i = 2 * net_rows[start]
+        min_x = max_x = positions[i]
+        min_y = max_y = positions[i + 1]
+        for k in range(start + 1, end):
+            i = 2 * net_rows[k]
+            x = positions[i]
+            y = positions[i + 1]
+            if x < min_x:
+                min_x = x
+            elif x > max_x:
+                max_x = x
+            if y < min_y:
+                min_y = y
+            elif y > max_y:
+                max_y = y
+        total += (max_x - min_x) + (max_y - min_y)
+    return total
 
 
 class Board:
@@ -148,30 +307,213 @@ class Board:
     - Use `place_near` to position parts relative to anchors.
     - Call `generate(filename)` to save (when `pcbnew` is available) or emit
       a JSON summary otherwise.
+
+    Alongside `parts`, the board keeps part origins and bbox sizes in flat
+    float64 arrays (`_positions`, `_sizes`; row `i` is `[2*i, 2*i + 1]`) so
+    placement math reads plain numbers instead of going through each
+    footprint. Rows are NaN until first read, and filled from the `Part`.
+    A part belongs to the board it was most recently added to.
+
+    Spatial queries (`nearest`, `find_overlaps`, `place_near_clear`) go
+    through a uniform grid over part origins, rebuilt lazily after any part
+    is added or moved.
     """
 
     def __init__(self):
         self.parts = []
-        if _HAS_PCBNEW:
+        self._positions = array("d")
+        self._sizes = array("d")
+        # (cell_size, {(col, row): [part indices]}), or None when stale.
+        self._grid = None
+        # The pcbnew board is only needed to save, so `generate` builds it on
+        # first use via `_ensure_board`.
+        self.board = None
+
+    def _ensure_board(self):
+        """Return the pcbnew board, creating it on first call.
+
+        Returns None when `pcbnew` is unavailable or no board can be created.
+        """
+        if self.board is not None or not _HAS_PCBNEW:
+            return self.board
+        for ctor in (getattr(pcbnew, "BOARD", None), getattr(pcbnew, "NewBoard", None)):
+            if ctor is None:
+                continue
             try:
-                self.board = pcbnew.BOARD()
+                self.board = ctor()
+                return self.board
             except Exception:
-                try:
-                    self.board = pcbnew.NewBoard()
-                except Exception:
-                    self.board = None
-        else:
-            self.board = None
+                continue
+        return None
 
     def add_part(self, part: Part, position_mm: Optional[Tuple[float, float]] = None):
         """Add a `Part` to the board.
 
         If `position_mm` is provided, the part origin will be set to that
         coordinate; otherwise the part's existing position is preserved.
+        Adding a part that is already on this board only updates its position.
+        A part may be on several boards; each keeps its own row in sync.
         """
+        if self not in part._rows:
+            part._rows[self] = len(self.parts)
+            self._positions.extend((_NAN, _NAN))
+            self._sizes.extend((_NAN, _NAN))
+            self.parts.append(part)
+            self._grid = None
         if position_mm is not None:
             part.set_position_mm(*position_mm)
-        self.parts.append(part)
+
+    def _invalidate_row(self, idx: int):
+        i = 2 * idx
+        self._positions[i] = self._positions[i + 1] = _NAN
+        self._sizes[i] = self._sizes[i + 1] = _NAN
+        self._grid = None
+
+    def _pos_of(self, part: Part) -> Tuple[float, float]:
+        """Return `part`'s origin, read from the position array when possible."""
+        idx = part._rows.get(self)
+        if idx is None:
+            return part.get_position_mm()
+        i = 2 * idx
+        x = self._positions[i]
+        if x != x:  # NaN: not read from the part yet
+            x, y = part.get_position_mm()
+            self._positions[i] = x
+            self._positions[i + 1] = y
+            return (x, y)
+        return (x, self._positions[i + 1])
+
+    def _size_of(self, part: Part) -> Tuple[float, float]:
+        """Return `part`'s bbox size, read from the size array when possible."""
+        idx = part._rows.get(self)
+        if idx is None:
+            return part.get_bbox_size_mm()
+        i = 2 * idx
+        w = self._sizes[i]
+        if w != w:
+            w, h = part.get_bbox_size_mm()
+            self._sizes[i] = w
+            self._sizes[i + 1] = h
+            return (w, h)
+        return (w, self._sizes[i + 1])
+
+    def _row(self, part) -> int:
+        """Return the array row for `part` (a `Part` on this board or an index)."""
+        if isinstance(part, Part):
+            idx = part._rows.get(self)
+            if idx is None:
+                raise ValueError(f"part {part.name!r} is not on this board")
+            return idx
+        return int(part)
+
+    def _fill_rows(self):
+        """Read any not-yet-known positions/sizes from their parts."""
+        positions, sizes = self._positions, self._sizes
+        for idx, part in enumerate(self.parts):
+            i = 2 * idx
+            if positions[i] != positions[i]:
+                positions[i], positions[i + 1] = part.get_position_mm()
+            if sizes[i] != sizes[i]:
+                sizes[i], sizes[i + 1] = part.get_bbox_size_mm()
+
+    def compute_hpwl(self, nets) -> float:
+        """Return the half-perimeter wirelength of `nets` over part origins.
+
+        `nets` is an iterable of nets, each an iterable of parts on this board
+        (`Part` objects or their indices in `parts`). A net's HPWL is the
+        width plus height of the box enclosing its parts' origins; nets with
+        fewer than two parts contribute nothing.
+        """
+        net_rows = array("q")
+        net_offsets = array("q", [0])
+        for net in nets:
+            net_rows.extend(self._row(p) for p in net)
+            net_offsets.append(len(net_rows))
+        self._fill_rows()
+        return _hpwl_kernel(self._positions, net_rows, net_offsets)
+
+    def find_overlaps(self):
+        """Return `(i, j)` index pairs of parts whose bounding boxes overlap.
+
+        Boxes are centred on each part's origin, as in `place_near`. Boxes
+        that only touch along an edge (to within `_OVERLAP_EPS`) are not
+        reported.
+        """
+        self._spatial_grid()
+        positions, sizes = self._positions, self._sizes
+        overlaps = []
+        for i in range(len(self.parts)):
+            x, y = positions[2 * i], positions[2 * i + 1]
+            w, h = sizes[2 * i], sizes[2 * i + 1]
+            overlaps.extend((i, j) for j in self._query_box(x, y, w, h) if j > i)
+        overlaps.sort()
+        return overlaps
+
+    def _spatial_grid(self):
+        """Return the (cell_size, cells) origin grid, rebuilding it if stale.
+
+        The cell size is the largest part dimension on the board, so any part
+        overlapping a box lies within half a cell of the box's extent.
+        """
+        if self._grid is None:
+            self._fill_rows()
+            positions = self._positions
+            cell = max(self._sizes, default=0.0) or 1.0
+            cells = {}
+            for idx in range(len(self.parts)):
+                key = (math.floor(positions[2 * idx] / cell), math.floor(positions[2 * idx + 1] / cell))
+                cells.setdefault(key, []).append(idx)
+            self._grid = (cell, cells)
+        return self._grid
+
+    def _query_box(self, x, y, w, h):
+        """Return indices of parts whose boxes overlap a `w` x `h` box at (x, y)."""
+        cell, cells = self._spatial_grid()
+        positions, sizes = self._positions, self._sizes
+        reach_x = (w + cell) * 0.5
+        reach_y = (h + cell) * 0.5
+        hits = []
+        for col in range(math.floor((x - reach_x) / cell), math.floor((x + reach_x) / cell) + 1):
+            for row in range(math.floor((y - reach_y) / cell), math.floor((y + reach_y) / cell) + 1):
+                for j in cells.get((col, row), ()):
+                    i = 2 * j
+                    if (abs(positions[i] - x) < (w + sizes[i]) * 0.5 - _OVERLAP_EPS
+                            and abs(positions[i + 1] - y) < (h + sizes[i + 1]) * 0.5 - _OVERLAP_EPS):
+                        hits.append(j)
+        return hits
+
+    def nearest(self, xy: Tuple[float, float], k: int = 1):
+        """Return up to `k` `(distance_mm, part)` pairs with origins nearest `xy`.
+
+        Searches grid rings outward from `xy`'s cell and stops once no
+        unvisited cell can hold anything closer than the current `k`-th hit.
+        """
+        cell, cells = self._spatial_grid()
+        if not cells or k < 1:
+            return []
+        positions = self._positions
+        x, y = float(xy[0]), float(xy[1])
+        cx, cy = math.floor(x / cell), math.floor(y / cell)
+        max_r = max(max(abs(col - cx), abs(row - cy)) for col, row in cells)
+        found = []
+        for r in range(max_r + 1):
+            if r == 0:
+                ring = [(cx, cy)]
+            else:
+                ring = [(cx + d, cy - r) for d in range(-r, r + 1)]
+                ring += [(cx + d, cy + r) for d in range(-r, r + 1)]
+                ring += [(cx - r, cy + d) for d in range(-r + 1, r)]
+                ring += [(cx + r, cy + d) for d in range(-r + 1, r)]
+            for key in ring:
+                for j in cells.get(key, ()):
+                    found.append((math.hypot(positions[2 * j] - x, positions[2 * j + 1] - y), j))
+            if len(found) >= k:
+                found.sort()
+                # Anything in ring r + 1 or beyond is at least r cells away.
+                if found[k - 1][0] <= r * cell:
+                    break
+        found.sort()
+        return [(d, self.parts[j]) for d, j in found[:k]]
 
     def place_near(self, part: Part, anchor: Part, distance: float = 5.0, direction: str = "right"):
         """Place `part` near `anchor`.
@@ -188,33 +530,191 @@ class Board:
         placement (respecting footprints' bounding boxes), callers can extend
         this method.
         """
-        ax, ay = anchor.get_position_mm()
+        nx, ny, _, _ = self._near_xy(part, anchor, distance, direction)
+        part.set_position_mm(nx, ny)
+        return (nx, ny)
+
+    def _near_xy(self, part: Part, anchor: Part, distance: float, direction: str):
+        """Return `(nx, ny, sx, sy)`: `place_near`'s target and direction step."""
+        ax, ay = self._pos_of(anchor)
 
         # Try to respect bounding boxes when computing placement so parts
         # don't overlap. If bounding-box data isn't available, fall back to
         # the simple origin-based shift.
-        aw, ah = anchor.get_bbox_size_mm() if hasattr(anchor, "get_bbox_size_mm") else (0.0, 0.0)
-        pw, ph = part.get_bbox_size_mm() if hasattr(part, "get_bbox_size_mm") else (0.0, 0.0)
-
-        dir_lower = str(direction).lower()
-        if dir_lower == "top":
-            nx = ax
-            ny = ay - (ah / 2.0) - (ph / 2.0) - float(distance)
-        elif dir_lower == "bottom":
-            nx = ax
-            ny = ay + (ah / 2.0) + (ph / 2.0) + float(distance)
-        elif dir_lower == "left":
-            nx = ax - (aw / 2.0) - (pw / 2.0) - float(distance)
-            ny = ay
-        elif dir_lower == "right":
-            nx = ax + (aw / 2.0) + (pw / 2.0) + float(distance)
-            ny = ay
-        else:
+        aw, ah = self._size_of(anchor)
+        pw, ph = self._size_of(part)
+
+        try:
+            sx, sy = _DIR_VECS[str(direction).lower()]
+        except KeyError:
             raise ValueError("direction must be one of: top, bottom, left, right")
 
+        distance = float(distance)
+        nx = ax + sx * ((aw + pw) * 0.5 + distance)
+        ny = ay + sy * ((ah + ph) * 0.5 + distance)
+        return (nx, ny, sx, sy)
+
+    def place_near_clear(self, part: Part, anchor: Part, distance: float = 5.0, direction: str = "right"):
+        """Like `place_near`, but keep moving `part` away until it overlaps nothing.
+
+        Starting at the spot `place_near` would pick, any parts in the way are
+        looked up through the spatial grid and `part` is pushed past the
+        farthest of them (plus `distance`) along `direction`, until the spot
+        is free. Returns the final position. `distance` must not be negative,
+        or the pushed spot would still overlap the same blocker.
+        """
+        distance = float(distance)
+        if distance < 0.0:
+            raise ValueError("distance must not be negative")
+        nx, ny, sx, sy = self._near_xy(part, anchor, distance, direction)
+        pw, ph = self._size_of(part)
+        me = part._rows.get(self)
+        while True:
+            blockers = [j for j in self._query_box(nx, ny, pw, ph) if j != me]
+            if not blockers:
+                break
+            # Far edge of each blocker along the direction of travel.
+            # The exit test is the same `_query_box` check `find_overlaps`
+            # uses, so the final spot is never reported as overlapping.
+            if sx:
+                edge = max(sx * self._positions[2 * j] + self._sizes[2 * j] * 0.5 for j in blockers)
+                nx = sx * (edge + distance + pw * 0.5)
+            else:
+                edge = max(sy * self._positions[2 * j + 1] + self._sizes[2 * j + 1] * 0.5 for j in blockers)
+                ny = sy * (edge + distance + ph * 0.5)
         part.set_position_mm(nx, ny)
         return (nx, ny)
 
+    def place_chain(self, parts, start_xy: Tuple[float, float], direction: str = "right", distance: float = 5.0):
+        """Place `parts` in a row, each one next to the previous.
+
+        The first part's origin is set to `start_xy`; every following part is
+        placed as `place_near(part, previous, distance, direction)` would, but
+        each part's bounding box is looked up only once and positions are
+        accumulated from a running cursor. Returns the list of new positions.
+        """
+        try:
+            dx, dy = _DIR_VECS[str(direction).lower()]
+        except KeyError:
+            raise ValueError("direction must be one of: top, bottom, left, right")
+
+        distance = float(distance)
+        cx, cy = float(start_xy[0]), float(start_xy[1])
+        positions = []
+        prev_w = prev_h = None
+        for part in parts:
+            w, h = self._size_of(part)
+            if prev_w is not None:
+                cx += dx * ((prev_w + w) * 0.5 + distance)
+                cy += dy * ((prev_h + h) * 0.5 + distance)
+            part.set_position_mm(cx, cy)
+            positions.append((cx, cy))
+            prev_w, prev_h = w, h
+        return positions
+
+    def greedy_place(self, order, nets, distance: float = 5.0, start_xy: Optional[Tuple[float, float]] = None):
+        """Place parts one at a time, each where it adds the least wirelength.
+
+        `order` lists the parts to place (`Part` objects or indices); `nets`
+        has the same form as for `compute_hpwl`. The first part stays where it
+        is, or moves to `start_xy` if given. Each following part is tried next
+        to the previous part and next to every already-placed part it shares
+        a net with, on all four sides (spaced as in `place_near`). Candidates
+        overlapping a placed part are rejected, and the one with the smallest
+        HPWL increase over the placed parts wins; ties keep the earliest
+        candidate, so with no nets this lays the parts out in a row to the
+        right. Returns the list of new positions, in `order`.
+        """
+        distance = float(distance)
+        rows = [self._row(p) for p in order]
+        if not rows:
+            return []
+        parts = self.parts
+
+        # Batch-local caches: each part's size is read once for the whole
+        # pass, and placed positions are the ones committed below, so the
+        # candidate loops never go back to the board arrays or the parts.
+        size = {r: self._size_of(parts[r]) for r in rows}
+        placed_xy = {}
+
+        # Per-net bounding box of the placed members, as a flat
+        # (k, 4) array of [min_x, max_x, min_y, max_y] rows.
+        net_rows = [[self._row(p) for p in net] for net in nets]
+        net_box = array("d", (_INF, -_INF, _INF, -_INF) * len(net_rows))
+        nets_of = {}
+        for n, members in enumerate(net_rows):
+            for r in members:
+                nets_of.setdefault(r, []).append(n)
+
+        def hits_placed(x, y, w, h):
+            hw, hh = w * 0.5, h * 0.5
+            for q, (qx, qy) in placed_xy.items():
+                qw, qh = size[q]
+                if abs(qx - x) < hw + qw * 0.5 and abs(qy - y) < hh + qh * 0.5:
+                    return True
+            return False
+
+        def commit(r, x, y):
+            parts[r].set_position_mm(x, y)
+            placed_xy[r] = (x, y)
+            for n in nets_of.get(r, ()):
+                b = 4 * n
+                if x < net_box[b]:
+                    net_box[b] = x
+                if x > net_box[b + 1]:
+                    net_box[b + 1] = x
+                if y < net_box[b + 2]:
+                    net_box[b + 2] = y
+                if y > net_box[b + 3]:
+                    net_box[b + 3] = y
+
+        first = rows[0]
+        if start_xy is not None:
+            x0, y0 = float(start_xy[0]), float(start_xy[1])
+        else:
+            x0, y0 = self._pos_of(parts[first])
+        commit(first, x0, y0)
+        prev = first
+        result = [(x0, y0)]
+
+        for r in rows[1:]:
+            pw, ph = size[r]
+            my_nets = nets_of.get(r, ())
+            neighbours = [prev]
+            for n in my_nets:
+                for q in net_rows[n]:
+                    if q in placed_xy and q not in neighbours:
+                        neighbours.append(q)
+
+            best = None
+            best_cost = _INF
+            for q in neighbours:
+                qx, qy = placed_xy[q]
+                qw, qh = size[q]
+                for sx, sy in _DIR_VECS.values():
+                    x = qx + sx * ((qw + pw) * 0.5 + distance)
+                    y = qy + sy * ((qh + ph) * 0.5 + distance)
+                    if hits_placed(x, y, pw, ph):
+                        continue
+                    cost = 0.0
+                    for n in my_nets:
+                        b = 4 * n
+                        if net_box[b] > net_box[b + 1]:
+                            continue  # no placed members yet
+                        cost += (max(net_box[b + 1], x) - min(net_box[b], x)) - (net_box[b + 1] - net_box[b])
+                        cost += (max(net_box[b + 3], y) - min(net_box[b + 2], y)) - (net_box[b + 3] - net_box[b + 2])
+                    if cost < best_cost:
+                        best, best_cost = (x, y), cost
+
+            if best is None:
+                # Every neighbouring slot is taken: go right of everything.
+                right = max(qx + size[q][0] * 0.5 for q, (qx, _) in placed_xy.items())
+                best = (right + distance + pw * 0.5, placed_xy[prev][1])
+            commit(r, *best)
+            prev = r
+            result.append(best)
+        return result
+
     def generate(self, filename: str):
         """Save the board.
 
@@ -224,30 +724,21 @@ class Board:
         """
         if _HAS_PCBNEW:
             try:
-                if self.board is None:
-                    try:
-                        self.board = pcbnew.BOARD()
-                    except Exception:
-                        try:
-                            self.board = pcbnew.NewBoard()
-                        except Exception:
-                            self.board = None
-
-                if self.board is not None:
+                if self._ensure_board() is not None:
                     def _create_simple_fp(name: str, x_mm: float, y_mm: float):
                         fp = pcbnew.FOOTPRINT(self.board)
                         fp.SetReference(name)
                         fp.SetValue(name)
-                        fp.SetPosition(pcbnew.VECTOR2I(int(_from_mm(x_mm)), int(_from_mm(y_mm))))
+                        fp.SetPosition(_V2I(int(_from_mm(x_mm)), int(_from_mm(y_mm))))
                         p1 = pcbnew.PAD(fp)
                         p1.SetNumber(1)
-                        p1.SetFPRelativePosition(pcbnew.VECTOR2I(int(_from_mm(-0.6)), 0))
-                        p1.SetSize(pcbnew.VECTOR2I(int(_from_mm(0.9)), int(_from_mm(0.9))))
+                        p1.SetFPRelativePosition(_PAD1_OFF)
+                        p1.SetSize(_PAD_SIZE)
                         p1.SetShape(pcbnew.PAD_SHAPE_RECT)
                         p2 = pcbnew.PAD(fp)
                         p2.SetNumber(2)
-                        p2.SetFPRelativePosition(pcbnew.VECTOR2I(int(_from_mm(0.6)), 0))
-                        p2.SetSize(pcbnew.VECTOR2I(int(_from_mm(0.9)), int(_from_mm(0.9))))
+                        p2.SetFPRelativePosition(_PAD2_OFF)
+                        p2.SetSize(_PAD_SIZE)
                         p2.SetShape(pcbnew.PAD_SHAPE_RECT)
                         fp.Add(p1)
                         fp.Add(p2)
@@ -271,11 +762,16 @@ class Board:
 
         import json
 
-        summary = {"parts": []}
-        for p in self.parts:
-            summary["parts"].append({"name": p.name, "pos_mm": p.get_position_mm()})
-
+        # Write one part record at a time rather than building the whole
+        # summary first; the layout matches `json.dump(summary, f, indent=2)`.
         with open(filename, "w", encoding="utf-8") as f:
-            json.dump(summary, f, indent=2)
+            f.write('{\n  "parts": [')
+            sep = "\n    "
+            for p in self.parts:
+                record = json.dumps({"name": p.name, "pos_mm": p.get_position_mm()}, indent=2)
+                f.write(sep)
+                f.write(record.replace("\n", "\n    "))
+                sep = ",\n    "
+            f.write("\n  ]\n}" if self.parts else "]\n}")
 
         return filename
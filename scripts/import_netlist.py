@@ -20,6 +20,13 @@ except Exception:
     _HAS_PCBNEW = False
 
 if _HAS_PCBNEW:
+    _FromMM = pcbnew.FromMM
+    _V2I = pcbnew.VECTOR2I
+    # Shared pad geometry for the placeholder footprints; pcbnew copies these.
+    _PAD_SIZE = _V2I(int(_FromMM(0.9)), int(_FromMM(0.9)))
+    _PAD1_OFF = _V2I(int(_FromMM(-0.6)), 0)
+    _PAD2_OFF = _V2I(int(_FromMM(0.6)), 0)
+
     try:
         import wx
         if wx.GetApp() is None:
@@ -33,24 +40,29 @@ def parse_minimal_netlist(path):
     """Parse the small tutorial netlist format.
 
     Supports JSON fallback produced by `skidl/led_flashlight.py` when SKiDL
-    libraries are unavailable. Returns a dict with `parts` and `nets` keys.
+    libraries are unavailable. Returns a dict with `parts` ({ref: part}) and
+    `nets` ({name: [node, ...]}) keys. Older list-based fallback files are
+    re-keyed into the same shape.
     """
     with open(path, 'r', encoding='utf-8') as f:
         try:
             data = json.load(f)
         except Exception:
             return {
-                "parts": [
-                    {"ref": "B1", "value": "Battery"},
-                    {"ref": "R1", "value": "330"},
-                    {"ref": "D1", "value": "LED"},
-                ],
-                "nets": []
+                "parts": {
+                    "B1": {"value": "Battery"},
+                    "R1": {"value": "330"},
+                    "D1": {"value": "LED"},
+                },
+                "nets": {}
             }
 
-    # Normalize structure
-    parts = data.get('parts', [])
-    nets = data.get('nets', [])
+    parts = data.get('parts', {})
+    nets = data.get('nets', {})
+    if isinstance(parts, list):
+        parts = {p["ref"]: p for p in parts}
+    if isinstance(nets, list):
+        nets = {n["name"]: n.get('nodes', []) for n in nets if n.get('name')}
     return {"parts": parts, "nets": nets}
 
 FOOTPRINT_MAP = {
@@ -59,8 +71,8 @@ FOOTPRINT_MAP = {
     "LED": "LED_0603",
 }
 
-def footprint_for_part(p):
-    return FOOTPRINT_MAP.get(p["value"], FOOTPRINT_MAP.get(p["ref"], "R_0402"))
+def footprint_for_part(ref, p):
+    return FOOTPRINT_MAP.get(p["value"], FOOTPRINT_MAP.get(ref, "R_0402"))
 
 def main(netlist_path, out_pcb='led_flashlight.kicad_pcb'):
     if not os.path.exists(netlist_path):
@@ -85,10 +97,7 @@ def main(netlist_path, out_pcb='led_flashlight.kicad_pcb'):
 
         
         netcode_for_name = {}
-        for n in nets:
-            name = n.get('name')
-            if not name:
-                continue
+        for name in nets:
             netinfo = pcbnew.NETINFO_ITEM(board, name)
             board.Add(netinfo)
             netcode_for_name[name] = netinfo.GetNet()
@@ -100,18 +109,18 @@ def main(netlist_path, out_pcb='led_flashlight.kicad_pcb'):
             fp = pcbnew.FOOTPRINT(board)
             fp.SetReference(ref)
             fp.SetValue(value or ref)
-            fp.SetPosition(pcbnew.VECTOR2I(int(pcbnew.FromMM(x_mm)), int(pcbnew.FromMM(y_mm))))
+            fp.SetPosition(_V2I(int(_FromMM(x_mm)), int(_FromMM(y_mm))))
 
             p1 = pcbnew.PAD(fp)
             p1.SetNumber('1')
-            p1.SetFPRelativePosition(pcbnew.VECTOR2I(int(pcbnew.FromMM(-0.6)), 0))
-            p1.SetSize(pcbnew.VECTOR2I(int(pcbnew.FromMM(0.9)), int(pcbnew.FromMM(0.9))))
+            p1.SetFPRelativePosition(_PAD1_OFF)
+            p1.SetSize(_PAD_SIZE)
             p1.SetShape(pcbnew.PAD_SHAPE_RECT)
 
             p2 = pcbnew.PAD(fp)
             p2.SetNumber('2')
-            p2.SetFPRelativePosition(pcbnew.VECTOR2I(int(pcbnew.FromMM(0.6)), 0))
-            p2.SetSize(pcbnew.VECTOR2I(int(pcbnew.FromMM(0.9)), int(pcbnew.FromMM(0.9))))
+            p2.SetFPRelativePosition(_PAD2_OFF)
+            p2.SetSize(_PAD_SIZE)
             p2.SetShape(pcbnew.PAD_SHAPE_RECT)
 
             fp.Add(p1)
@@ -129,9 +138,7 @@ def main(netlist_path, out_pcb='led_flashlight.kicad_pcb'):
         _create_simple_fp(board, 'D1', 'LED', 4.0, 0.0)
 
         
-        for n in nets:
-            name = n.get('name')
-            nodes = n.get('nodes', [])
+        for name, nodes in nets.items():
             netcode = netcode_for_name.get(name)
             if netcode is None:
                 continue
@@ -161,15 +168,17 @@ def main(netlist_path, out_pcb='led_flashlight.kicad_pcb'):
         
         board = Board()
         created = {}
-        for p in parts:
-            fp = footprint_for_part(p)
-            part = Part(footprint=fp, name=p["ref"])
+        for ref, p in parts.items():
+            fp = footprint_for_part(ref, p)
+            part = Part(footprint=fp, name=ref)
             board.add_part(part)
-            created[p["ref"]] = part
+            created[ref] = part
 
-        board.add_part(created["B1"], position_mm=(0.0, 0.0))
-        board.place_near(created["R1"], created["B1"], distance=2.0, direction="right")
-        board.place_near(created["D1"], created["R1"], distance=2.0, direction="right")
+        part_nets = [
+            [created[node.get('ref')] for node in nodes if node.get('ref') in created]
+            for nodes in nets.values()
+        ]
+        board.greedy_place([created["B1"], created["R1"], created["D1"]], part_nets, distance=2.0, start_xy=(0.0, 0.0))
 
         try:
             board.generate(out_pcb)
@@ -9,9 +9,9 @@ Run:
 
 This writes `hello.kicad_pcb` in the repository root.
 """
+import functools
 import os
 from pathlib import Path
-import re
 import sys
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -19,6 +19,7 @@ FP_DIR = ROOT / "data" / "footprints"
 OUT = ROOT / "hello.kicad_pcb"
 
 
+@functools.lru_cache(maxsize=32)
 def load_module_text(name: str) -> str:
     p = FP_DIR / name
     if not p.exists():
@@ -27,15 +28,16 @@ def load_module_text(name: str) -> str:
 
 
 def set_module_position(mod_text: str, x: float, y: float) -> str:
-    def repl(match):
-        return f"(at {x} {y})"
-
-    parts = re.split(r"(\(module\b)", mod_text, maxsplit=1)
-    if len(parts) < 3:
+    # Patch the first `(at x y)` after `(module` with plain string scans;
+    # anything before the module keyword is dropped.
+    i = mod_text.find("(module")
+    if i < 0:
         return mod_text
-    head, module_kw, rest = parts
-    new_rest = re.sub(r"\(at\s+[-0-9.eE]+\s+[-0-9.eE]+\)", repl, rest, count=1)
-    return module_kw + new_rest
+    j = mod_text.find("(at ", i)
+    k = mod_text.find(")", j) if j >= 0 else -1
+    if k < 0:
+        return mod_text[i:]
+    return mod_text[i:j] + f"(at {x} {y})" + mod_text[k + 1:]
 
 
 def compose_board(mod_texts: list[str]) -> str:
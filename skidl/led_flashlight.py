@@ -3,54 +3,270 @@
 Generates a tiny netlist for a battery -> resistor -> LED circuit.
 Run with KiCad Python (kicadpy) to emit a netlist that the OpenPCB importer will consume.
 """
-import json
-
-try:
-	from skidl import Part, Net, generate_netlist
-
-	BAT = Part('Device', 'Battery_Cell', ref='B1', footprint='Battery_Cell')
-	R1 = Part('Device', 'R', ref='R1', value='330', footprint='R_0402')
-	D1 = Part('Device', 'LED', ref='D1', value='LED', footprint='LED_0603')
-
-	VPLUS = Net('V+')
-	GND = Net('GND')
-
-	VPLUS += BAT['+'], R1[1], D1['A']
-	GND += BAT['-'], D1['K']
-
-	generate_netlist()
-	print('Wrote led_flashlight.net')
-
-except Exception as e:
-	print(f"SKiDL error: {e}")
-	import traceback
-	traceback.print_exc()
-	fallback = {
-		"parts": [
-			{"ref": "B1", "value": "Battery", "footprint": "Battery_Cell"},
-			{"ref": "R1", "value": "330", "footprint": "R_0402"},
-			{"ref": "D1", "value": "LED", "footprint": "LED_0603"},
-		],
-		"nets": [
-			{
-				"name": "V+",
-				"nodes": [
-					{"ref": "B1", "pad": "1"},
-					{"ref": "R1", "pad": "1"},
-					{"ref": "D1", "pad": "1"}
-				]
-			},
-			{
-				"name": "GND",
-				"nodes": [
-					{"ref": "B1", "pad": "2"},
-					{"ref": "D1", "pad": "2"}
-				]
-			}
-		]
+import hashlib
+import os
+import shutil
+import sys
+from functools import lru_cache, partial
+
+NETLIST = 'led_flashlight.net'
+
+# Netlists are written here and then renamed over NETLIST, so a reader
+# polling NETLIST never sees a partially written file.
+NETLIST_TMP = NETLIST + '.tmp'
+
+
+def _say(msg):
+	"""Report progress on stdout unless OPENPCB_QUIET is set."""
+	if not os.environ.get('OPENPCB_QUIET'):
+		sys.stdout.write(msg + '\n')
+
+
+# The circuit is fixed, so the netlist only changes when this script does.
+# The stamp records the script's hash and the netlist's mtime from the last
+# SKiDL build; while both still match, the build (and the SKiDL import) is
+# skipped. The fallback never writes a stamp.
+STAMP = NETLIST + '.stamp'
+
+
+def _stamp_value():
+	with open(__file__, 'rb') as f:
+		src_hash = hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+	return f'{src_hash} {os.stat(NETLIST).st_mtime_ns}'.encode()
+
+
+def _is_up_to_date():
+	try:
+		with open(STAMP, 'rb') as f:
+			return f.read() == _stamp_value()
+	except OSError:
+		return False
+
+
+def _write_stamp():
+	try:
+		value = _stamp_value()
+		with open(STAMP, 'wb') as f:
+			f.write(value)
+	except OSError:
+		pass
+
+
+# Each symbol is loaded once per process as a SKiDL template, and instances
+# are stamped out by calling it. Across runs, SKiDL's own library pickle
+# (config.pickle_dir) already avoids re-parsing the symbol libraries.
+@lru_cache(maxsize=None)
+def _part_template(lib, name):
+	from skidl import Part, TEMPLATE
+
+	return Part(lib, name, dest=TEMPLATE)
+
+
+def cached_part(lib, name, **attrs):
+	"""Instantiate `lib`/`name` like `Part(lib, name, **attrs)`, via the template cache."""
+	return _part_template(lib, name)(**attrs)
+
+
+DevicePart = partial(cached_part, 'Device')
+
+
+# Netlist written when SKiDL or its libraries are unavailable: the fixed
+# circuit as compact JSON (json.dumps(..., separators=(',', ':')) layout),
+# with parts keyed by ref and nets keyed by name (each a list of nodes), and
+# %s slots for the R1 value and the D1 footprint (each filled with a quoted
+# JSON string).
+_FALLBACK_TEMPLATE = (
+	b'{"parts":{'
+	b'"B1":{"value":"Battery","footprint":"Battery_Cell"},'
+	b'"R1":{"value":%s,"footprint":"R_0402"},'
+	b'"D1":{"value":"LED","footprint":%s}'
+	b'},"nets":{'
+	b'"V+":[{"ref":"B1","pad":"1"},{"ref":"R1","pad":"1"},{"ref":"D1","pad":"1"}],'
+	b'"GND":[{"ref":"B1","pad":"2"},{"ref":"D1","pad":"2"}]'
+	b'}}'
+)
+
+
+# The circuit as data. _SYMBOLS holds each distinct part kind once, as its
+# Device symbol and the attributes every instance gets (no value keeps the
+# symbol's default); _PARTS_SPEC maps refs to those kinds, and _NETS_SPEC
+# lists (name, ((ref, pin), ...)) per net, where pin is a pin number (int) or
+# a pin name (str).
+_SYMBOLS = {
+	'bat': ('Battery_Cell', {'footprint': 'Battery_Cell'}),
+	'r': ('R', {'value': '330', 'footprint': 'R_0402'}),
+	'led': ('LED', {'value': 'LED', 'footprint': 'LED_0603'}),
+}
+
+_PARTS_SPEC = (
+	('B1', 'bat'),
+	('R1', 'r'),
+	('D1', 'led'),
+)
+
+_NETS_SPEC = (
+	('V+', (('B1', '+'), ('R1', 1), ('D1', 'A'))),
+	('GND', (('B1', '-'), ('D1', 'K'))),
+)
+
+
+def _build():
+	"""Instantiate and wire the circuit described by the spec tables."""
+	from skidl import Net
+
+	parts = {}
+	for ref, kind in _PARTS_SPEC:
+		sym, attrs = _SYMBOLS[kind]
+		parts[ref] = DevicePart(sym, ref=ref, **attrs)
+
+	# Integer pins are pin numbers and string pins are pin names; searching only
+	# that field (part.p / part.n) skips the other half of SKiDL's pin filters.
+	# Every net's pins are resolved into one bucket first (deduplicated by
+	# identity, as SKiDL pins hash) and handed to a single connect() call.
+	wiring = {
+		name: dict.fromkeys(
+			parts[ref].p[pin] if isinstance(pin, int) else parts[ref].n[pin]
+			for ref, pin in pins
+		)
+		for name, pins in _NETS_SPEC
 	}
+	for name, pins in wiring.items():
+		Net(name).connect(*pins)
+	return parts, wiring
+
+
+# Generated netlists are kept here under a hash of the built circuit, so an
+# identical circuit is copied back instead of regenerated.
+NETLIST_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'openpcb')
+
+
+def _lib_stamp(part):
+	"""Return (path, mtime_ns) of the library file `part` was loaded from, or None."""
+	lib = getattr(part, 'lib', None)
+	for path in (getattr(lib, 'filepath', None), getattr(lib, 'filename', None)):
+		if isinstance(path, str) and os.path.isfile(path):
+			return (os.path.abspath(path), os.stat(path).st_mtime_ns)
+	return None
+
+
+def _circuit_key(parts, wiring):
+	"""Hash the parts, their library files and each net's pins.
+
+	Returns None when a part's library file can't be located, since edits
+	to it could then go unnoticed.
+	"""
+	from skidl.pckg_info import __version__
+
+	part_keys = []
+	for ref, p in parts.items():
+		stamp = _lib_stamp(p)
+		if stamp is None:
+			return None
+		part_keys.append((ref, p.name, str(p.value), str(p.footprint), stamp))
+	key = (
+		__version__,
+		sorted(part_keys),
+		sorted((name, sorted((pin.part.ref, pin.num) for pin in pins)) for name, pins in wiring.items()),
+	)
+	return hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+
+
+def _generate(parts, wiring):
+	"""Write the SKiDL netlist to NETLIST_TMP, reusing a cached copy when possible.
+
+	Any failure in the cache lookup or store falls through to (or keeps) a
+	regular generate_netlist() run.
+	"""
+	from skidl import generate_netlist
+
+	cached = None
+	try:
+		key = _circuit_key(parts, wiring)
+		if key is not None:
+			cached = os.path.join(NETLIST_CACHE_DIR, f'led_flashlight.{key}.net')
+			if os.path.exists(cached):
+				shutil.copyfile(cached, NETLIST_TMP)
+				return
+	except Exception:
+		cached = None
+
+	generate_netlist(file_=NETLIST_TMP)
+	if cached is None:
+		return
+	try:
+		os.makedirs(NETLIST_CACHE_DIR, exist_ok=True)
+		shutil.copyfile(NETLIST_TMP, cached + '.tmp')
+		os.replace(cached + '.tmp', cached)
+	except Exception:
+		pass
+
+
+def _json_str(value):
+	if value.isascii() and value.isprintable() and '"' not in value and '\\' not in value:
+		return b'"' + value.encode() + b'"'
+	import json
+	return json.dumps(value).encode()
+
+
+def _fallback_bytes(r_value, led_footprint):
+	return _FALLBACK_TEMPLATE % (_json_str(str(r_value)), _json_str(led_footprint))
+
+
+def build_netlist(r_value='330', led_footprint='LED_0603'):
+	"""Return the fallback netlist for a flashlight variant as a dict, without writing it."""
+	import json
+	return json.loads(_fallback_bytes(r_value, led_footprint))
+
+
+def emit_flashlight(r_value='330', led_footprint='LED_0603', path=NETLIST):
+	"""Write the fallback JSON netlist for a flashlight variant to `path`.
+
+	Needs neither SKiDL nor a JSON encoder, so it is cheap to call in a loop
+	when generating many variants. Set OPENPCB_PRETTY for indented output.
+	"""
+	data = _fallback_bytes(r_value, led_footprint)
+	if os.environ.get('OPENPCB_PRETTY'):
+		import json
+		data = json.dumps(json.loads(data), indent=2).encode('utf-8')
+	tmp = path + '.tmp'
+	with open(tmp, 'wb') as f:
+		f.write(data)
+	os.replace(tmp, path)
+
+
+def _write_fallback():
+	# No stamp here: the placeholder must be rebuilt once SKiDL or its
+	# libraries become available.
+	emit_flashlight()
+	_say('SKiDL libs unavailable — wrote fallback JSON netlist: led_flashlight.net')
+
+
+def main():
+	if _is_up_to_date():
+		_say(f'{NETLIST} is up to date')
+		return
+
+	try:
+		import skidl
+	except ImportError as e:
+		sys.stderr.write(f'SKiDL error: {e}\n')
+		_write_fallback()
+		return
+
+	try:
+		_generate(*_build())
+		os.replace(NETLIST_TMP, NETLIST)
+	except Exception as e:
+		# SKiDL is installed but the build failed, e.g. missing symbol libraries.
+		sys.stderr.write(f'SKiDL error: {e}\n')
+		if os.environ.get('OPENPCB_DEBUG'):
+			import traceback
+			traceback.print_exc(file=sys.stderr)
+		_write_fallback()
+	else:
+		_write_stamp()
+		_say('Wrote led_flashlight.net')
 
-	with open('led_flashlight.net', 'w', encoding='utf-8') as f:
-		json.dump(fallback, f, indent=2)
 
-	print('SKiDL libs unavailable — wrote fallback JSON netlist: led_flashlight.net')
+if __name__ == '__main__':
+	main()